@@ -1,17 +1,284 @@
 import sys
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import pandas as pd
 import numpy as np
 import matplotlib.dates as mdates
+from matplotlib.animation import FuncAnimation, PillowWriter, FFMpegWriter
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
-    QPushButton, QFileDialog, QLabel, QMessageBox, QGroupBox, QComboBox, QCheckBox, QAction, QSplitter
+    QPushButton, QFileDialog, QLabel, QMessageBox, QGroupBox, QComboBox, QCheckBox, QAction, QSplitter,
+    QDoubleSpinBox, QListWidget, QListWidgetItem
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT
 
+# Частота кадров анимации профиля и высоты уровней MTP-5
+ANIMATION_FPS = 30
+# PillowWriter держит все кадры в памяти, поэтому для GIF без ffmpeg сохраняется не более
+# GIF_MAX_FRAMES кадров; частота кадров снижается так же, чтобы длительность ролика не менялась
+GIF_MAX_FRAMES = 150
+PROFILE_ALTITUDES = np.arange(0, 1001, 50)
+
+# Условия поиска событий: ключ -> (название, единица измерения)
+EVENT_CONDITIONS = {
+    'gradient': ("Градиент 0–200 м выше порога", "°C/100 м"),
+    'cooling': ("Охлаждение у земли быстрее порога", "K/ч"),
+}
+# Скорость охлаждения считается за час; шаг больше MAX_SAMPLE_GAP считается разрывом в данных,
+# который отбрасывает окно охлаждения и прерывает интервал события
+COOLING_WINDOW = np.timedelta64(60, 'm')
+MAX_SAMPLE_GAP = np.timedelta64(10, 'm')
+
+
+def read_profile_file(data_file):
+    """
+    Читает файл MTP-5 и возвращает массив моментов времени и матрицу температур
+    (строки — измерения, столбцы — высоты 0–1000 м).
+    """
+    df = pd.read_csv(data_file, sep="\t", skiprows=26, header=None, decimal=',')
+    times = pd.to_datetime(df[0], format='%d/%m/%Y %H:%M:%S', errors='coerce')
+    valid = times.notna().to_numpy()
+    temperatures = df.iloc[:, 1:len(PROFILE_ALTITUDES) + 1].to_numpy(dtype=float)
+    return times[valid].to_numpy(), temperatures[valid]
+
+
+def build_profile_frames(data_files, start_time, end_time):
+    """
+    Заранее готовит кадры анимации: моменты времени и профили температуры
+    от start_time первого дня до end_time последнего дня.
+    """
+    times_parts = []
+    temperature_parts = []
+    for data_file in data_files:
+        times, temperatures = read_profile_file(data_file)
+        times_parts.append(times)
+        temperature_parts.append(temperatures)
+    if not times_parts:
+        return np.array([], dtype='datetime64[ns]'), np.empty((0, len(PROFILE_ALTITUDES)))
+
+    times = np.concatenate(times_parts)
+    frames = np.vstack(temperature_parts)
+    order = np.argsort(times, kind='stable')
+    times, frames = times[order], frames[order]
+    if len(times) == 0:
+        return times, frames
+
+    # Окно времени: от часа начала первого дня до часа конца последнего дня
+    window_start = times[0].astype('datetime64[D]') + np.timedelta64(start_time, 'h')
+    window_end = times[-1].astype('datetime64[D]') + np.timedelta64(end_time, 'h')
+    mask = (times >= window_start) & (times <= window_end)
+    return times[mask], np.ascontiguousarray(frames[mask])
+
+
+def make_profile_animation(figure, ax, times, frames, blit=True):
+    """
+    Создает анимацию вертикального профиля температуры. Кадры берутся
+    из заранее подготовленных массивов, обновляется одна и та же линия.
+    """
+    time_labels = pd.DatetimeIndex(times).strftime('%Y-%m-%d %H:%M:%S')
+    profile_line, = ax.plot(frames[0], PROFILE_ALTITUDES, 'o-', color='tab:red', markersize=3)
+    time_text = ax.text(0.02, 0.96, '', transform=ax.transAxes, fontsize=11)
+
+    # Оси фиксируются заранее, чтобы при блиттинге не перерисовывать фон
+    ax.set_xlim(np.nanmin(frames) - 0.5, np.nanmax(frames) + 0.5)
+    ax.set_ylim(PROFILE_ALTITUDES[0], PROFILE_ALTITUDES[-1])
+    ax.set_xlabel('Температура (°C)')
+    ax.set_ylabel('Высота (м)')
+    ax.set_title('Вертикальный профиль температуры')
+    ax.grid()
+
+    def init_frame():
+        profile_line.set_xdata(frames[0])
+        time_text.set_text(time_labels[0])
+        return profile_line, time_text
+
+    def update_frame(i):
+        profile_line.set_xdata(frames[i])
+        time_text.set_text(time_labels[i])
+        return profile_line, time_text
+
+    return FuncAnimation(figure, update_frame, frames=len(frames), init_func=init_frame,
+                         interval=1000 / ANIMATION_FPS, blit=blit, repeat=True)
+
+
+def stop_animation(animation, canvas):
+    """
+    Окончательно останавливает анимацию с блиттингом и возвращает ее линиям
+    обычную отрисовку.
+    """
+    # pause() снимает флаг animated, иначе полная перерисовка стирает профиль
+    animation.pause()
+
+    # В matplotlib нет открытого способа отключить анимацию от холста: обработчик
+    # изменения размера (_on_resize -> _end_redraw) снова запускает таймер после pause(),
+    # а первая отрисовка холста (_first_draw_id -> _start) запускает его, если анимация
+    # еще не стартовала. Закрытые атрибуты используются, только если они существуют.
+    first_draw_id = getattr(animation, '_first_draw_id', None)
+    if first_draw_id is not None:
+        canvas.mpl_disconnect(first_draw_id)
+    resize_id = getattr(animation, '_resize_id', None)
+    if resize_id is not None:
+        canvas.mpl_disconnect(resize_id)
+
+
+def surface_cooling_rate(history_times, history_surface, times):
+    """
+    Вычисляет скорость охлаждения у земли (K/ч) за час до каждого момента times
+    как T(t - 1 ч) - T(t). Окна с разрывом в данных дают NaN.
+    """
+    order = np.argsort(history_times, kind='stable')
+    history_times, history_surface = history_times[order], history_surface[order]
+
+    # Повторяющиеся моменты времени дали бы нулевой шаг
+    keep = np.r_[True, np.diff(history_times) > np.timedelta64(0, 's')]
+    history_times, history_surface = history_times[keep], history_surface[keep]
+
+    gap_count = np.r_[0, np.cumsum(np.diff(history_times) > MAX_SAMPLE_GAP)]
+    end = np.searchsorted(history_times, times)
+    start = np.searchsorted(history_times, times - COOLING_WINDOW)
+    elapsed = history_times[end] - history_times[start]
+
+    valid = ((gap_count[start] == gap_count[end]) & (elapsed >= COOLING_WINDOW - MAX_SAMPLE_GAP)
+             & (elapsed > np.timedelta64(0, 's')))
+    rates = np.full(len(times), np.nan)
+    hours = elapsed[valid] / np.timedelta64(1, 'h')
+    rates[valid] = (history_surface[start[valid]] - history_surface[end[valid]]) / hours
+    return rates
+
+
+def evaluate_event_condition(data_file, condition, previous_file=None):
+    """
+    Вычисляет для всего файла ряд значений условия поиска:
+    градиент между 0 и 200 м или скорость охлаждения у земли.
+    Для охлаждения учитывается последний час предыдущего дня.
+    """
+    times, temperatures = read_profile_file(data_file)
+    if condition == 'gradient':
+        level_200 = np.searchsorted(PROFILE_ALTITUDES, 200)
+        values = (temperatures[:, level_200] - temperatures[:, 0]) / 200 * 100
+        return times, values
+    if condition == 'cooling':
+        if len(times) == 0:
+            return times, np.empty(0)
+        history_times, history_surface = times, temperatures[:, 0]
+        if previous_file is not None:
+            previous_times, previous_temperatures = read_profile_file(previous_file)
+            tail = previous_times >= times.min() - COOLING_WINDOW
+            history_times = np.concatenate([previous_times[tail], times])
+            history_surface = np.concatenate([previous_temperatures[tail, 0], history_surface])
+        return times, surface_cooling_rate(history_times, history_surface, times)
+    raise ValueError(f"Неизвестное условие поиска: {condition}")
+
+
+def find_events(times, values, threshold):
+    """
+    Находит интервалы превышения порога в упорядоченном по времени ряду.
+    Интервал прерывается разрывом в данных, каждый интервал дает одно
+    событие — индекс момента максимального значения.
+    """
+    exceeded = values > threshold
+    if not exceeded.any():
+        return np.array([], dtype=int)
+    continues = np.r_[False, exceeded[:-1] & (np.diff(times) <= MAX_SAMPLE_GAP)]
+    run_starts = exceeded & ~continues
+    run_ids = np.cumsum(run_starts)[exceeded]
+    positions = np.flatnonzero(exceeded)
+    peaks = pd.Series(values[exceeded]).groupby(run_ids).idxmax().to_numpy()
+    return positions[peaks]
+
+
+class EventSearchWorker(QThread):
+    """
+    Вычисляет условие поиска для файлов папки в пуле процессов.
+    """
+    search_finished = pyqtSignal(object, object)
+    search_failed = pyqtSignal(str)
+
+    def __init__(self, tasks, condition):
+        super().__init__()
+        # tasks: список пар (файл, файл предыдущего дня или None)
+        self.tasks = tasks
+        self.condition = condition
+
+    def run(self):
+        results = {}
+        failed_files = []
+        try:
+            # spawn вместо fork: процесс Qt уже многопоточный
+            with ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn')) as pool:
+                futures = {pool.submit(evaluate_event_condition, data_file, self.condition, previous_file): data_file
+                           for data_file, previous_file in self.tasks}
+                for future in as_completed(futures):
+                    if self.isInterruptionRequested():
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return
+                    data_file = futures[future]
+                    try:
+                        results[data_file] = future.result()
+                    except Exception:
+                        failed_files.append(os.path.basename(data_file))
+            self.search_finished.emit(results, sorted(failed_files))
+        except Exception as error:
+            self.search_failed.emit(str(error))
+
+
+class ProfileExportWorker(QThread):
+    """
+    Сохраняет анимацию профиля в GIF или MP4 в фоновом потоке.
+    """
+    export_finished = pyqtSignal(str, str)
+    export_failed = pyqtSignal(str)
+
+    def __init__(self, data_files, start_time, end_time, output_path, output_format):
+        super().__init__()
+        self.data_files = data_files
+        self.start_time = start_time
+        self.end_time = end_time
+        self.output_path = output_path
+        self.output_format = output_format
+
+    def check_interruption(self, frame, total_frames):
+        # Прервать сохранение при закрытии окна
+        if self.isInterruptionRequested():
+            raise InterruptedError("Экспорт прерван.")
+
+    def run(self):
+        try:
+            times, frames = build_profile_frames(self.data_files, self.start_time, self.end_time)
+            if len(frames) == 0 or not np.isfinite(frames).any():
+                self.export_failed.emit("В выбранном интервале нет данных.")
+                return
+
+            # Отдельная фигура с холстом Agg, не связанная с окном приложения
+            figure = Figure(figsize=(6, 8))
+            FigureCanvasAgg(figure)
+            ax = figure.add_subplot(111)
+            note = ""
+            # ffmpeg пишет кадры в файл по мере отрисовки, в том числе для GIF
+            if FFMpegWriter.isAvailable():
+                writer = FFMpegWriter(fps=ANIMATION_FPS)
+            elif self.output_format == 'mp4':
+                self.export_failed.emit("Для сохранения MP4 требуется ffmpeg.")
+                return
+            else:
+                step = -(-len(frames) // GIF_MAX_FRAMES)
+                if step > 1:
+                    note = (f"ffmpeg не найден: сохранен каждый {step}-й кадр из {len(frames)}, "
+                            f"частота снижена до {ANIMATION_FPS / step:.1f} кадр/с.")
+                times, frames = times[::step], frames[::step]
+                writer = PillowWriter(fps=ANIMATION_FPS / step)
+
+            animation = make_profile_animation(figure, ax, times, frames, blit=False)
+            animation.save(self.output_path, writer=writer, dpi=100, progress_callback=self.check_interruption)
+            self.export_finished.emit(self.output_path, note)
+        except Exception as error:
+            self.export_failed.emit(str(error))
+
 
 class TemperaturePlotApp(QMainWindow):
     def __init__(self):
@@ -161,6 +428,27 @@ class TemperaturePlotApp(QMainWindow):
         graph_layout = QVBoxLayout()
         graph_layout.addWidget(self.toolbar)
         graph_layout.addWidget(self.canvas)
+
+        # Панель анимации профиля
+        animation_layout = QHBoxLayout()
+        animation_layout.addWidget(QLabel("Анимация профиля до дня:"))
+        self.end_day_combo = QComboBox(self)
+        animation_layout.addWidget(self.end_day_combo)
+
+        self.play_animation_button = QPushButton("Воспроизвести", self)
+        self.play_animation_button.clicked.connect(self.show_profile_animation)
+        animation_layout.addWidget(self.play_animation_button)
+
+        self.stop_animation_button = QPushButton("Остановить", self)
+        self.stop_animation_button.clicked.connect(self.stop_profile_animation)
+        animation_layout.addWidget(self.stop_animation_button)
+
+        self.export_animation_button = QPushButton("Экспорт GIF/MP4", self)
+        self.export_animation_button.clicked.connect(self.export_profile_animation)
+        animation_layout.addWidget(self.export_animation_button)
+        animation_layout.addStretch()
+
+        graph_layout.addLayout(animation_layout)
         graph_group.setLayout(graph_layout)
 
         # Добавлен разделитель для разделения левого и правого.
@@ -169,7 +457,40 @@ class TemperaturePlotApp(QMainWindow):
         left_widget.setLayout(left_layout)
         splitter.addWidget(left_widget)
         splitter.addWidget(graph_group)
-        splitter.setSizes([400, 1200])  # Изначальный размер
+
+        # GroupBox поиска событий по всей папке
+        event_group = QGroupBox("Поиск событий")
+        event_layout = QVBoxLayout()
+
+        self.event_condition_combo = QComboBox(self)
+        for condition, (title, unit) in EVENT_CONDITIONS.items():
+            self.event_condition_combo.addItem(f"{title} ({unit})", condition)
+        event_layout.addWidget(QLabel("Условие:"))
+        event_layout.addWidget(self.event_condition_combo)
+
+        self.event_threshold_spin = QDoubleSpinBox(self)
+        self.event_threshold_spin.setRange(-100.0, 100.0)
+        self.event_threshold_spin.setDecimals(2)
+        self.event_threshold_spin.setSingleStep(0.1)
+        self.event_threshold_spin.setValue(1.0)
+        event_layout.addWidget(QLabel("Порог:"))
+        event_layout.addWidget(self.event_threshold_spin)
+
+        self.search_events_button = QPushButton("Найти события", self)
+        self.search_events_button.clicked.connect(self.search_events)
+        event_layout.addWidget(self.search_events_button)
+
+        self.event_status_label = QLabel("Поиск не выполнялся", self)
+        self.event_status_label.setAlignment(Qt.AlignCenter)
+        event_layout.addWidget(self.event_status_label)
+
+        self.event_list = QListWidget(self)
+        self.event_list.itemDoubleClicked.connect(self.jump_to_event)
+        event_layout.addWidget(self.event_list)
+
+        event_group.setLayout(event_layout)
+        splitter.addWidget(event_group)
+        splitter.setSizes([400, 1200, 320])  # Изначальный размер
 
         # principal layout
         main_layout.addWidget(splitter)
@@ -183,10 +504,20 @@ class TemperaturePlotApp(QMainWindow):
         self.data_file = None
         self.data_folder = None
         self.files_in_folder = []
+        self.colorbar = None
+        self.profile_animation = None
+        self.export_worker = None
+        self.event_cache = {}
+        self.event_search_worker = None
+        self.pending_event_query = None
 
     def load_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Выберите папку с данными")
         if folder_path:
+            # Результаты поиска относятся к прежней папке
+            self.event_list.clear()
+            self.pending_event_query = None
+            self.event_status_label.setText("Поиск не выполнялся")
             self.data_folder = folder_path
             files = os.listdir(folder_path)
             txt_files = [f for f in files if f.endswith('.txt')]
@@ -198,12 +529,16 @@ class TemperaturePlotApp(QMainWindow):
                 dates = [f[4:12] for f in txt_files]  # Извлечь ГГГГММДД
                 formatted_dates = [f"{date[:4]}-{date[4:6]}-{date[6:]}" for date in dates]  # Formater en AAAA-MM-JJ
 
+                # Список дней окончания заполняется первым: выбор файла синхронизирует его
+                self.end_day_combo.clear()
+                self.end_day_combo.addItems(sorted(formatted_dates))
                 self.file_combo.addItems(formatted_dates)
             else:
                 self.folder_label.setText("Текстовые файлы не найдены.")
         else:
             self.folder_label.setText("Папка не выбрана")
             self.file_combo.clear()
+            self.end_day_combo.clear()
             self.file_label.setText("Файл не выбран")
 
     def update_file_label(self):
@@ -214,6 +549,7 @@ class TemperaturePlotApp(QMainWindow):
                 if f"{selected_date.replace('-', '')}" in file:
                     self.data_file = os.path.join(self.data_folder, file)
                     self.file_label.setText(f"Файл загружен : {file}")
+                    self.end_day_combo.setCurrentText(selected_date)
                     QMessageBox.information(self, "Файл загружен", f"Выбранный файл : {file}")
                     break
         else:
@@ -230,6 +566,7 @@ class TemperaturePlotApp(QMainWindow):
         self.end_altitude_combo.setEnabled(is_checked)
 
     def plot_graph(self, plot_function, start_time, end_time, start_altitude, end_altitude):
+        self.stop_profile_animation()
         self.ax.clear()  # Очистить старую диаграмму
         plot_function(self.ax, self.data_file, start_time, end_time, start_altitude, end_altitude)
         self.canvas.draw()
@@ -335,12 +672,228 @@ class TemperaturePlotApp(QMainWindow):
         ax.set_title('Температура как функция высоты и времени')
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
 
+    def get_animation_files(self):
+        # Файлы от выбранного дня до дня окончания анимации, по порядку дат
+        start_day = self.file_combo.currentText().replace('-', '')
+        end_day = max(self.end_day_combo.currentText().replace('-', ''), start_day)
+        return [os.path.join(self.data_folder, f) for f in sorted(self.files_in_folder)
+                if start_day <= f[4:12] <= end_day]
+
+    def get_animation_interval(self):
+        if not self.data_file:
+            QMessageBox.warning(self, "Нет файла", "Выберите файл перед просмотром графика.")
+            return None
+
+        start_time = int(self.start_time_combo.currentText().split(":")[0]) if self.time_checkbox.isChecked() else 0
+        end_time = int(self.end_time_combo.currentText().split(":")[0]) if self.time_checkbox.isChecked() else 24
+
+        data_files = self.get_animation_files()
+
+        # Для одного дня проверяется порядок часов, для нескольких дней окно переходит через полночь
+        if len(data_files) == 1 and start_time >= end_time:
+            QMessageBox.warning(self, "Ошибка во временном интервале",
+                                "Время начала не может быть больше или равно времени конца.")
+            return None
+        return data_files, start_time, end_time
+
+    def show_profile_animation(self):
+        interval = self.get_animation_interval()
+        if interval is None:
+            return
+        data_files, start_time, end_time = interval
+
+        times, frames = build_profile_frames(data_files, start_time, end_time)
+        if len(frames) == 0 or not np.isfinite(frames).any():
+            QMessageBox.warning(self, "Нет данных", "В выбранном интервале нет данных.")
+            return
+
+        self.stop_profile_animation()
+        if self.colorbar:
+            self.colorbar.remove()
+            self.colorbar = None
+        self.ax.clear()
+        self.profile_animation = make_profile_animation(self.canvas.figure, self.ax, times, frames)
+        self.canvas.draw()
+
+    def stop_profile_animation(self):
+        if self.profile_animation is not None:
+            animation = self.profile_animation
+            self.profile_animation = None
+            stop_animation(animation, self.canvas)
+            self.canvas.draw_idle()
+
+    def export_profile_animation(self):
+        interval = self.get_animation_interval()
+        if interval is None:
+            return
+        data_files, start_time, end_time = interval
+
+        output_path, selected_filter = QFileDialog.getSaveFileName(self, "Сохранить анимацию", "profile.gif",
+                                                                   "GIF (*.gif);;MP4 (*.mp4)")
+        if not output_path:
+            return
+
+        # Формат определяется введенным расширением, а без него — выбранным фильтром
+        extension = os.path.splitext(output_path)[1].lower()
+        if extension in ('.gif', '.mp4'):
+            output_format = extension[1:]
+        else:
+            output_format = 'mp4' if selected_filter.startswith('MP4') else 'gif'
+            output_path += f'.{output_format}'
+
+        self.export_animation_button.setEnabled(False)
+        self.export_worker = ProfileExportWorker(data_files, start_time, end_time, output_path, output_format)
+        self.export_worker.export_finished.connect(self.on_export_finished)
+        self.export_worker.export_failed.connect(self.on_export_failed)
+        self.export_worker.start()
+
+    def on_export_finished(self, output_path, note):
+        self.export_animation_button.setEnabled(True)
+        if note:
+            QMessageBox.warning(self, "Экспорт завершен", f"Анимация сохранена : {output_path}\n{note}")
+        else:
+            QMessageBox.information(self, "Экспорт завершен", f"Анимация сохранена : {output_path}")
+
+    def on_export_failed(self, message):
+        self.export_animation_button.setEnabled(True)
+        QMessageBox.warning(self, "Ошибка экспорта", f"Не удалось сохранить анимацию : {message}")
+
+    def get_event_tasks(self, condition):
+        # Время изменения файлов фиксируется один раз при запуске запроса
+        data_files = sorted(f for f in self.files_in_folder if f.startswith('0mtp'))
+        files_by_day = {f[4:12]: f for f in data_files}
+        tasks = []
+        skipped_files = []
+        for file in data_files:
+            data_file = os.path.join(self.data_folder, file)
+            previous_file = None
+            if condition == 'cooling':
+                previous_day = pd.to_datetime(file[4:12], format='%Y%m%d', errors='coerce') - pd.Timedelta(days=1)
+                if not pd.isna(previous_day) and previous_day.strftime('%Y%m%d') in files_by_day:
+                    previous_file = os.path.join(self.data_folder, files_by_day[previous_day.strftime('%Y%m%d')])
+            try:
+                stamp = (os.path.getmtime(data_file), previous_file,
+                         os.path.getmtime(previous_file) if previous_file else None)
+            except OSError:
+                skipped_files.append(file)
+                continue
+            tasks.append((data_file, previous_file, stamp))
+        return tasks, skipped_files
+
+    def search_events(self):
+        if not self.data_folder:
+            QMessageBox.warning(self, "Нет папки", "Выберите папку с данными перед поиском событий.")
+            return
+
+        condition = self.event_condition_combo.currentData()
+        tasks, skipped_files = self.get_event_tasks(condition)
+
+        # Кэш хранит по одному ряду на файл и условие вместе с отметкой времени изменения
+        series = {}
+        missing_tasks = []
+        for data_file, previous_file, stamp in tasks:
+            cached = self.event_cache.get((data_file, condition))
+            if cached is not None and cached[0] == stamp:
+                series[data_file] = cached[1]
+            else:
+                missing_tasks.append((data_file, previous_file, stamp))
+        if not missing_tasks:
+            self.show_events(series, condition, skipped_files)
+            return
+
+        self.search_events_button.setEnabled(False)
+        self.event_status_label.setText(f"Обработка файлов : {len(missing_tasks)}")
+        self.pending_event_query = (condition, series, missing_tasks, skipped_files)
+        self.event_search_worker = EventSearchWorker([(f, p) for f, p, _ in missing_tasks], condition)
+        self.event_search_worker.search_finished.connect(self.on_event_search_finished)
+        self.event_search_worker.search_failed.connect(self.on_event_search_failed)
+        self.event_search_worker.start()
+
+    def on_event_search_finished(self, results, failed_files):
+        self.search_events_button.setEnabled(True)
+        if self.pending_event_query is None:
+            # Папка сменилась во время поиска
+            return
+        condition, series, missing_tasks, skipped_files = self.pending_event_query
+        self.pending_event_query = None
+        for data_file, _, stamp in missing_tasks:
+            if data_file in results:
+                self.event_cache[(data_file, condition)] = (stamp, results[data_file])
+                series[data_file] = results[data_file]
+        self.show_events(series, condition, skipped_files + failed_files)
+
+    def on_event_search_failed(self, message):
+        self.search_events_button.setEnabled(True)
+        self.pending_event_query = None
+        self.event_status_label.setText("Ошибка поиска")
+        QMessageBox.warning(self, "Ошибка поиска", f"Не удалось выполнить поиск событий : {message}")
+
+    def show_events(self, series, condition, skipped_files):
+        threshold = self.event_threshold_spin.value()
+        unit = EVENT_CONDITIONS[condition][1]
+        events = []
+        if series:
+            # Ряды всех дней объединяются, чтобы интервал через полночь дал одно событие
+            data_files = list(series)
+            times = np.concatenate([series[f][0] for f in data_files])
+            values = np.concatenate([series[f][1] for f in data_files])
+            file_ids = np.repeat(np.arange(len(data_files)), [len(series[f][0]) for f in data_files])
+            order = np.argsort(times, kind='stable')
+            times, values, file_ids = times[order], values[order], file_ids[order]
+            for i in find_events(times, values, threshold):
+                events.append((times[i], values[i], data_files[file_ids[i]]))
+
+        self.event_list.clear()
+        for event_time, value, data_file in events:
+            event_time = pd.Timestamp(event_time)
+            item = QListWidgetItem(f"{event_time:%Y-%m-%d %H:%M}   {value:.2f} {unit}")
+            item.setData(Qt.UserRole, (data_file, event_time))
+            self.event_list.addItem(item)
+        status = f"Найдено событий : {len(events)}"
+        if skipped_files:
+            status += f", пропущено файлов : {len(skipped_files)}"
+        self.event_status_label.setText(status)
+
+        if skipped_files:
+            QMessageBox.warning(self, "Файлы пропущены",
+                                "Не удалось обработать файлы :\n" + "\n".join(skipped_files))
+
+    def jump_to_event(self, item):
+        data_file, event_time = item.data(Qt.UserRole)
+        if not os.path.exists(data_file):
+            QMessageBox.warning(self, "Нет файла", f"Файл события не найден : {data_file}")
+            return
+        file = os.path.basename(data_file)
+        self.data_file = data_file
+
+        # Переключить выбор дня без повторного сообщения о загрузке файла
+        self.file_combo.blockSignals(True)
+        self.file_combo.setCurrentText(f"{event_time:%Y-%m-%d}")
+        self.file_combo.blockSignals(False)
+        self.end_day_combo.setCurrentText(f"{event_time:%Y-%m-%d}")
+        self.file_label.setText(f"Файл загружен : {file}")
+
+        # Показать линейный график в окне ±1 час вокруг события
+        self.plot_graph(self.plot_line_graph_internal, 0, 24, 0, 1000)
+        self.ax.axvline(event_time, color='black', linestyle='--', linewidth=1)
+        self.ax.set_xlim(event_time - pd.Timedelta(hours=1), event_time + pd.Timedelta(hours=1))
+        self.canvas.draw()
+
     def show_info(self):
         QMessageBox.information(self, "Информация",
                                 "Программа для анализа температурных данных по высоте и времени.\n"
                                 "Выберите папку с данными, затем выберите файл и настройте интервалы.")
 
+    def closeEvent(self, event):
+        # Дождаться завершения фоновых потоков, чтобы не уничтожить работающий поток
+        for worker in (self.export_worker, self.event_search_worker):
+            if worker is not None and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait()
+        event.accept()
+
     def quit_app(self):
+        self.close()
         QApplication.quit()
 
 